@@ -0,0 +1,100 @@
+import cProfile
+import functools
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+
+class Recorder:
+    """Opt-in call counters, timers and profiling for benchmark runs.
+
+    Nothing here touches the lab code unless `instrument` is called, which
+    wraps the named module functions so every call is counted and timed.
+    `capture` optionally runs a block under cProfile and/or tracemalloc.
+    """
+
+    def __init__(self, profile=False, trace_memory=False, output_dir=None):
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.output_dir = output_dir
+        self.timings = defaultdict(float)
+        self.counters = Counter()
+        self._patched = []
+
+    def instrument(self, module, *names):
+        """Replace `module.<name>` with a wrapper that counts and times each call.
+        Calls made through the module's globals (e.g. one lab function calling
+        another) go through the wrapper too."""
+        prefix = getattr(module, "__name__", type(module).__name__).rsplit(".", 1)[-1]
+        for name in names:
+            original = getattr(module, name)
+            key = f"{prefix}.{name}"
+
+            @functools.wraps(original)
+            def wrapper(*args, _original=original, _key=key, **kwargs):
+                self.counters[_key] += 1
+                start = time.perf_counter()
+                try:
+                    return _original(*args, **kwargs)
+                finally:
+                    self.timings[_key] += time.perf_counter() - start
+
+            setattr(module, name, wrapper)
+            self._patched.append((module, name, original))
+
+    def restore(self):
+        while self._patched:
+            module, name, original = self._patched.pop()
+            setattr(module, name, original)
+
+    def reset(self):
+        self.timings.clear()
+        self.counters.clear()
+
+    def snapshot(self):
+        return {
+            "timings": dict(self.timings),
+            "counters": dict(self.counters)
+        }
+
+    @contextmanager
+    def capture(self, name, result):
+        """Run a block under cProfile/tracemalloc if enabled, adding what was
+        captured to the `result` dict."""
+        profiler = cProfile.Profile() if self.profile else None
+        if self.trace_memory:
+            tracemalloc.start()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+                result["profile_top"] = _top_functions(profiler)
+                if self.output_dir:
+                    os.makedirs(self.output_dir, exist_ok=True)
+                    path = os.path.join(self.output_dir, f"{name}.prof")
+                    profiler.dump_stats(path)
+                    result["profile_file"] = path
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                result["peak_memory_bytes"] = peak
+
+
+def _top_functions(profiler, limit=10):
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, func), (_, ncalls, _, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": f"{os.path.basename(filename)}:{line}({func})",
+            "calls": ncalls,
+            "cumulative_s": cumtime
+        })
+    rows.sort(key=lambda r: r["cumulative_s"], reverse=True)
+    return rows[:limit]
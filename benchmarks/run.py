@@ -0,0 +1,147 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from instrumentation import Recorder
+from suites import ROOT, SCALES, SUITES
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_case(case, recorder, repeat, instrument):
+    result = {"lab": case.lab, "case": case.name, "scale": case.scale, "size": case.size}
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.run()
+        times.append(time.perf_counter() - start)
+    result.update({
+        "repeat": repeat,
+        "times_s": times,
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "mean_s": statistics.fmean(times)
+    })
+
+    # Instrumented and profiled passes run after the timed ones so their
+    # overhead never ends up in the timings above.
+    if instrument and case.hooks:
+        recorder.reset()
+        for obj, names in case.hooks:
+            recorder.instrument(obj, *names)
+        try:
+            case.run()
+        finally:
+            recorder.restore()
+        result["instrumentation"] = recorder.snapshot()
+    if recorder.profile or recorder.trace_memory:
+        with recorder.capture(f"{case.lab}-{case.name}-{case.scale}", result):
+            case.run()
+    return result
+
+
+def run_benchmarks(labs, scales, repeat, recorder, instrument):
+    results, skipped, failed = [], [], []
+    for lab in labs:
+        for factory in SUITES[lab]:
+            for scale in scales:
+                try:
+                    cases = factory(scale)
+                except (ImportError, OSError, LookupError) as e:
+                    # Missing optional dependency, model or corpus: record and move on.
+                    reason = f"{type(e).__name__}: {e}".splitlines()[0]
+                    skipped.append({"lab": lab, "suite": factory.__name__, "scale": scale, "reason": reason})
+                    print(f"[skip] {factory.__name__} ({scale}): {reason}")
+                    break
+                for case in cases:
+                    try:
+                        result = run_case(case, recorder, repeat, instrument)
+                    except Exception as e:
+                        # One broken case should not discard the results of all the others.
+                        reason = f"{type(e).__name__}: {e}".splitlines()[0]
+                        failed.append({"lab": case.lab, "case": case.name, "scale": case.scale, "reason": reason})
+                        print(f"[fail] {case.name} ({case.scale}): {reason}")
+                        continue
+                    results.append(result)
+                    print(f"{case.lab:5} {case.name:22} {case.scale:7} size={case.size:<7} "
+                          f"median={result['median_s'] * 1000:10.2f} ms")
+    return results, skipped, failed
+
+
+def compare(results, baseline, threshold):
+    """Print median time ratios against a previous results file; returns the regressions."""
+    previous = {(r["lab"], r["case"], r["scale"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\n=== Comparison with baseline ({baseline['meta'].get('commit') or 'unknown commit'}) ===")
+    for r in results:
+        old = previous.get((r["lab"], r["case"], r["scale"]))
+        if old is None:
+            continue
+        ratio = r["median_s"] / old["median_s"] if old["median_s"] else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions.append({**r, "baseline_median_s": old["median_s"], "ratio": ratio})
+        print(f"{r['lab']:5} {r['case']:22} {r['scale']:7} {old['median_s'] * 1000:10.2f} ms -> "
+              f"{r['median_s'] * 1000:10.2f} ms  ({ratio:.2f}x){flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths of all labs")
+    parser.add_argument("--labs", nargs="+", choices=sorted(SUITES), default=sorted(SUITES))
+    parser.add_argument("--scales", nargs="+", choices=SCALES, default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--instrument", action="store_true",
+                        help="count and time calls to each case's hot functions")
+    parser.add_argument("--profile", action="store_true", help="capture a cProfile run per case")
+    parser.add_argument("--trace-memory", action="store_true", help="record peak memory with tracemalloc")
+    parser.add_argument("--profile-dir", default="profiles", help="where .prof files are written")
+    parser.add_argument("--compare", metavar="BASELINE", help="previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="median time ratio above which a case counts as a regression")
+    args = parser.parse_args()
+
+    recorder = Recorder(profile=args.profile, trace_memory=args.trace_memory, output_dir=args.profile_dir)
+    results, skipped, failed = run_benchmarks(args.labs, args.scales, args.repeat, recorder, args.instrument)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+            "instrumented": args.instrument
+        },
+        "results": results,
+        "skipped": skipped,
+        "failed": failed
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved as '{args.output}'")
+    if failed:
+        print(f"{len(failed)} case(s) failed; see 'failed' in '{args.output}'")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than {args.threshold:.2f}x the baseline")
+            sys.exit(1)
@@ -0,0 +1,270 @@
+import importlib.util
+import os
+import random
+import re
+import string
+import sys
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCALES = ("small", "medium", "large")
+SEED = 42
+
+# `run` is the timed callable; `hooks` lists (object, [attribute names]) the
+# recorder may wrap with call counters when instrumentation is enabled.
+Case = namedtuple("Case", ["lab", "name", "scale", "size", "run", "hooks"])
+
+
+def add_lab_path(lab):
+    lab_dir = os.path.join(ROOT, lab)
+    if lab_dir not in sys.path:
+        sys.path.insert(0, lab_dir)
+    return lab_dir
+
+
+def load_lab_module(lab, filename):
+    """Import a lab script by path (file names such as task1-5.py are not valid
+    module names). The lab directory is put on sys.path for sibling imports."""
+    lab_dir = add_lab_path(lab)
+    name = f"{lab}_{os.path.splitext(filename)[0].replace('-', '_')}"
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(lab_dir, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def synthetic_words(rng, vocab_size, alphabet=string.ascii_lowercase):
+    words = set()
+    while len(words) < vocab_size:
+        words.add(''.join(rng.choices(alphabet, k=rng.randint(2, 9))))
+    return sorted(words)
+
+
+def synthetic_sentences(rng, n_sentences, vocab, min_len=4, max_len=12):
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    return [' '.join(rng.choices(vocab, weights=weights, k=rng.randint(min_len, max_len)))
+            for _ in range(n_sentences)]
+
+
+def whitespace_pre_tokenize(text):
+    """Offline stand-in for GPT-2's pre-tokenizer: words with a 'Ġ' marker for
+    a preceding space, plus their offsets."""
+    return [("Ġ" + m.group() if m.start() > 0 else m.group(), m.span())
+            for m in re.finditer(r"\S+", text)]
+
+
+def lab1_similarity(scale):
+    module = load_lab_module("lab1", "task1.py")
+    n_words = {"small": 10, "medium": 200, "large": 5000}[scale]
+    rng = random.Random(SEED)
+    vocab = synthetic_words(rng, max(n_words // 2, 5))
+    s1, s2 = synthetic_sentences(rng, 2, vocab, n_words, n_words)
+
+    def run():
+        words_a = module.preprocess_sentence(s1)
+        words_b = module.preprocess_sentence(s2)
+        module.euclidean_similarity(*module.binary_vectors(words_a, words_b))
+        module.cosine_similarity(*module.frequency_vectors(words_a, words_b))
+        module.jaccard_similarity(set(words_a), set(words_b))
+        module.overlap_similarity(set(words_a), set(words_b))
+
+    hooks = [(module, ["binary_vectors", "frequency_vectors", "euclidean_similarity",
+                       "cosine_similarity", "jaccard_similarity", "overlap_similarity"])]
+    return [Case("lab1", "similarity_metrics", scale, n_words, run, hooks)]
+
+
+def lab1_wordnet(scale):
+    module = load_lab_module("lab1", "task2.py")
+    n_words = {"small": 20, "medium": 200, "large": 2000}[scale]
+    lemmas = sorted(module.wn.all_lemma_names())
+    words = random.Random(SEED).sample(lemmas, n_words)
+
+    def run():
+        for word in words:
+            module.get_wordnet_relations(word)
+
+    return [Case("lab1", "get_wordnet_relations", scale, n_words, run,
+                 [(module, ["get_wordnet_relations"])])]
+
+
+def lab1_semantic_search(scale):
+    add_lab_path("lab1")
+    from semantic_index import SemanticIndex
+
+    n_sentences = {"small": 1000, "medium": 20000, "large": 200000}[scale]
+    rng = random.Random(SEED)
+    vocab = synthetic_words(rng, 5000)
+    store = synthetic_sentences(rng, n_sentences, vocab, 6, 20)
+    queries = rng.sample(store, 100)
+    index = SemanticIndex(n_components=100, n_lists=32).fit(store)
+
+    return [
+        Case("lab1", "semantic_query", scale, n_sentences, lambda: index.query(queries, k=10),
+             [(index, ["embed", "_exhaustive"])]),
+        Case("lab1", "semantic_query_ivf", scale, n_sentences,
+             lambda: index.query(queries, k=10, n_probe=4), [(index, ["embed", "_probe"])])
+    ]
+
+
+def lab2_bpe(scale):
+    module = load_lab_module("lab2", "task1.py")
+    n_sentences, vocab_size = {"small": (50, 100), "medium": (500, 300), "large": (5000, 1000)}[scale]
+    rng = random.Random(SEED)
+    corpus = synthetic_sentences(rng, n_sentences, synthetic_words(rng, n_sentences))
+    texts = synthetic_sentences(rng, 100, synthetic_words(rng, 500))
+    word_freqs = module.compute_word_freqs(corpus, whitespace_pre_tokenize)
+    _, merges = module.train_bpe(word_freqs, vocab_size)
+
+    def train():
+        module.train_bpe(word_freqs, vocab_size)
+
+    def tokenize():
+        for text in texts:
+            module.tokenize(text, merges, whitespace_pre_tokenize)
+
+    hooks = [(module, ["compute_pair_freqs", "merge_pair"])]
+    return [
+        Case("lab2", "bpe_train", scale, n_sentences, train, hooks),
+        Case("lab2", "bpe_tokenize", scale, len(merges), tokenize, [(module, ["tokenize"])])
+    ]
+
+
+def lab2_ngram(scale):
+    module = load_lab_module("lab2", "task2-3.py")
+    n_words = {"small": 1000, "medium": 10000, "large": 100000}[scale]
+    rng = random.Random(SEED)
+    vocab = synthetic_words(rng, 2000, alphabet="abcdefghijlmnoprstuvxzăîâșț")
+    corpus = ' '.join(synthetic_sentences(rng, n_words // 8 + 1, vocab, 8, 8)).split()[:n_words]
+    trained = module.NGramLM(3)
+    trained.train(corpus)
+
+    def train():
+        module.NGramLM(3).train(corpus)
+
+    def generate():
+        trained.generate(20)
+
+    return [
+        Case("lab2", "ngram_train", scale, n_words, train, [(module.NGramLM, ["train"])]),
+        Case("lab2", "ngram_generate", scale, n_words, generate, [(trained, ["prob"])])
+    ]
+
+
+def lab3_question_answer(scale):
+    # Only use a model that is already cached locally.
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    module = load_lab_module("lab3", "task1.py")
+    tokenizer, model = module.load_model()
+    # Sized in BERT input positions for question and context together; BERT
+    # takes at most 512, and random words split into several wordpieces each.
+    n_tokens = {"small": 64, "medium": 192, "large": 512}[scale]
+    rng = random.Random(SEED)
+    vocab = synthetic_words(rng, 300)
+    question = "where was the cake baked?"
+    answer = "the cake was baked in paris"
+    budget = n_tokens - len(tokenizer.encode(question, answer))
+    filler = []
+    while True:
+        word = rng.choice(vocab)
+        cost = len(tokenizer.tokenize(word))
+        if cost > budget:
+            break
+        filler.append(word)
+        budget -= cost
+    context = ' '.join(filler + [answer])
+    size = len(tokenizer.encode(question, context))
+
+    def run():
+        module.question_answer(question, context)
+
+    hooks = [(tokenizer, ["encode", "convert_ids_to_tokens"]), (model, ["forward"])]
+    return [Case("lab3", "question_answer", scale, size, run, hooks)]
+
+
+def _grammar_sentences(module, n_sentences):
+    from nltk.parse.generate import generate
+    pool = [' '.join(words) for words in generate(module.grammar, depth=7, n=20000)]
+    return random.Random(SEED).choices(pool, k=n_sentences)
+
+
+def lab4_chart_parser(scale):
+    module = load_lab_module("lab4", "task1-2.py")
+    n_sentences = {"small": 10, "medium": 100, "large": 1000}[scale]
+    sentences = _grammar_sentences(module, n_sentences)
+
+    def run():
+        for sent in sentences:
+            list(module.parser.parse(sent.split()))
+
+    return [Case("lab4", "chart_parse", scale, n_sentences, run, [(module.parser, ["parse"])])]
+
+
+def lab4_dependency_parser(scale):
+    import spacy
+    grammar_module = load_lab_module("lab4", "task1-2.py")
+    module = load_lab_module("lab4", "task3.py")
+    nlp = spacy.load(module.MODEL)
+    n_sentences = {"small": 10, "medium": 100, "large": 1000}[scale]
+    sentences = [s.capitalize() + "." for s in _grammar_sentences(grammar_module, n_sentences)]
+
+    def run():
+        for doc in nlp.pipe(sentences):
+            module.dependency_triples(doc)
+
+    return [Case("lab4", "dependency_parse", scale, n_sentences, run,
+                 [(nlp, ["pipe"]), (module, ["dependency_triples"])])]
+
+
+def lab5_pipeline(scale):
+    add_lab_path("lab5")
+    # Modules, not names, so instrumentation patches are seen by the cases.
+    import preprocessing
+    import sweep
+    import vectorization
+    from bench_preprocessing import make_corpus
+
+    n_docs = {"small": 500, "medium": 5000, "large": 50000}[scale]
+    documents = make_corpus(n_docs, vocab_size=5000, doc_len=80)
+    token_docs = preprocessing.preprocess_corpus(documents)
+    vectors = vectorization.vectorize(token_docs)
+
+    # Bound now: the instrumented `stem` wrapper has no cache_clear.
+    clear_stem_cache = preprocessing.stem.cache_clear
+
+    def preprocess_serial():
+        clear_stem_cache()
+        preprocessing.preprocess_corpus(documents, n_jobs=1)
+
+    def fit(family, matrix):
+        return lambda: sweep.fit_one(family, "bench", 10, matrix, vectors.dictionary, lda_passes=1)
+
+    fit_hooks = [(sweep, ["fit_one", "_top_terms", "gensim_corpus"])]
+    return [
+        # Calls inside pool workers are not counted, so the stemming hooks sit
+        # on the single-process case.
+        Case("lab5", "preprocess", scale, n_docs, lambda: preprocessing.preprocess_corpus(documents),
+             [(preprocessing, ["preprocess_corpus"])]),
+        Case("lab5", "preprocess_serial", scale, n_docs, preprocess_serial,
+             [(preprocessing, ["preprocess", "stem"])]),
+        Case("lab5", "vectorize", scale, n_docs, lambda: vectorization.vectorize(token_docs),
+             [(vectorization, ["count_matrix", "tfidf_from_counts", "gensim_dictionary"])]),
+        Case("lab5", "fit_lsa", scale, n_docs, fit("lsa", vectors.tfidf), fit_hooks),
+        Case("lab5", "fit_nmf", scale, n_docs, fit("nmf", vectors.tfidf), fit_hooks),
+        Case("lab5", "fit_lda", scale, n_docs, fit("lda", vectors.counts), fit_hooks)
+    ]
+
+
+SUITES = {
+    "lab1": [lab1_similarity, lab1_wordnet, lab1_semantic_search],
+    "lab2": [lab2_bpe, lab2_ngram],
+    "lab3": [lab3_question_answer],
+    "lab4": [lab4_chart_parser, lab4_dependency_parser],
+    "lab5": [lab5_pipeline]
+}
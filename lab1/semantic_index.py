@@ -0,0 +1,164 @@
+import importlib.util
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+def _load_task1():
+    # Loaded by path: lab2 and lab3 also have a task1.py, so a plain import
+    # would depend on sys.path order.
+    name = "lab1_task1"
+    if name not in sys.modules:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "task1.py")
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+_task1 = _load_task1()
+preprocess_sentence = _task1.preprocess_sentence
+jaccard_similarity = _task1.jaccard_similarity
+
+
+class SemanticIndex:
+    """Top-k cosine search over sentences projected into an LSA space.
+
+    Sentences are embedded with TF-IDF + TruncatedSVD (as in lab5) and kept as
+    L2-normalized rows of one contiguous float32 matrix, so cosine similarity
+    is a dot product. Queries scan the matrix in blocks of `block_size` rows.
+    With `n_lists` set, rows are also clustered into that many partitions
+    (IVF-style) and stored partition by partition, so a query can scan only
+    the `n_probe` partitions whose centroids are closest.
+    """
+
+    def __init__(self, n_components=100, n_lists=None, block_size=65536, random_state=42):
+        self.n_components = n_components
+        self.n_lists = n_lists
+        self.block_size = block_size
+        self.random_state = random_state
+
+    def fit(self, sentences):
+        self.sentences = list(sentences)
+        self.vectorizer = TfidfVectorizer(tokenizer=preprocess_sentence, lowercase=False, token_pattern=None)
+        tfidf = self.vectorizer.fit_transform(self.sentences)
+        n_components = max(1, min(self.n_components, tfidf.shape[1] - 1, tfidf.shape[0] - 1))
+        self.svd = TruncatedSVD(n_components=n_components, random_state=self.random_state)
+        vectors = self._normalize(self.svd.fit_transform(tfidf))
+
+        # Row i of self.vectors holds sentence self.ids[i].
+        self.ids = np.arange(len(self.sentences))
+        self.centroids = None
+        if self.n_lists and self.n_lists > 1 and len(self.sentences) > self.n_lists:
+            kmeans = MiniBatchKMeans(n_clusters=self.n_lists, n_init=3, random_state=self.random_state)
+            labels = kmeans.fit_predict(vectors)
+            self.ids = np.argsort(labels, kind="stable")
+            self.offsets = np.searchsorted(labels[self.ids], np.arange(self.n_lists + 1))
+            self.centroids = self._normalize(kmeans.cluster_centers_)
+        self.vectors = np.ascontiguousarray(vectors[self.ids])
+        return self
+
+    @staticmethod
+    def _normalize(matrix):
+        matrix = np.asarray(matrix, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return np.ascontiguousarray(matrix / norms)
+
+    def embed(self, sentences):
+        return self._normalize(self.svd.transform(self.vectorizer.transform(sentences)))
+
+    def similarity(self, sentence_a, sentence_b):
+        a, b = self.embed([sentence_a, sentence_b])
+        return float(a @ b)
+
+    def _exhaustive(self, queries, k):
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        for start in range(0, len(self.vectors), self.block_size):
+            block = self.vectors[start:start + self.block_size]
+            scores = np.concatenate([best_scores, queries @ block.T], axis=1)
+            block_rows = np.broadcast_to(np.arange(start, start + len(block)), (len(queries), len(block)))
+            rows = np.concatenate([best_rows, block_rows], axis=1)
+            keep = min(k, scores.shape[1])
+            top = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+            best_scores = np.take_along_axis(scores, top, axis=1)
+            best_rows = np.take_along_axis(rows, top, axis=1)
+        return best_scores, best_rows
+
+    def _probe(self, queries, k, n_probe):
+        """Top-k over the `n_probe` closest partitions of each query. Each
+        partition is scored once, as a contiguous slice, against all the
+        queries that probe it; rows of -1 mark unfilled slots."""
+        probed = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :n_probe]
+        best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        best_rows = np.full((len(queries), k), -1, dtype=np.int64)
+        for l in np.unique(probed):
+            start, end = self.offsets[l], self.offsets[l + 1]
+            if start == end:
+                continue
+            members = np.nonzero((probed == l).any(axis=1))[0]
+            scores = np.concatenate([best_scores[members], queries[members] @ self.vectors[start:end].T], axis=1)
+            block_rows = np.broadcast_to(np.arange(start, end), (len(members), end - start))
+            rows = np.concatenate([best_rows[members], block_rows], axis=1)
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            best_scores[members] = np.take_along_axis(scores, top, axis=1)
+            best_rows[members] = np.take_along_axis(rows, top, axis=1)
+        return best_scores, best_rows
+
+    def query(self, sentences, k=5, n_probe=None):
+        """Top-k most similar stored sentences for each query, as lists of
+        (sentence index, cosine similarity), best first. A single string gives
+        a single list. `n_probe` restricts the search to that many partitions
+        when the index was built with `n_lists`; otherwise the scan is exhaustive."""
+        single = isinstance(sentences, str)
+        queries = self.embed([sentences] if single else sentences)
+        k = min(k, len(self.vectors))
+        if self.centroids is not None and n_probe and n_probe < self.n_lists:
+            found = self._probe(queries, k, n_probe)
+        else:
+            found = self._exhaustive(queries, k)
+
+        results = []
+        for scores, rows in zip(*found):
+            order = np.argsort(-scores)
+            results.append([(int(self.ids[rows[i]]), float(scores[i])) for i in order if rows[i] >= 0])
+        return results[0] if single else results
+
+
+if __name__ == "__main__":
+    store = [
+        "The man saw a car in the park",
+        "I saw the man park the car",
+        "A man noticed an automobile in the park",
+        "The car was parked by the man",
+        "She bought fresh bread at the bakery",
+        "The bakery sells fresh bread every morning",
+        "Children were playing football in the park",
+        "The kids played soccer at the park",
+        "He drove the car to the city",
+        "The city traffic was heavy this morning",
+        "A woman walked her dog in the park",
+        "The dog ran after the ball in the park",
+    ]
+    index = SemanticIndex(n_components=8, n_lists=3).fit(store)
+
+    query = "The kids played football in the park"
+    start = time.perf_counter()
+    exhaustive = index.query(query, k=3)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    probed = index.query(query, k=3, n_probe=1)
+
+    print(f"Query: {query}\n")
+    print(f"{'LSA cosine':>10}  {'Jaccard':>7}  Sentence")
+    for i, score in exhaustive:
+        jaccard = jaccard_similarity(set(preprocess_sentence(query)), set(preprocess_sentence(store[i])))
+        print(f"{score:10.4f}  {jaccard:7.4f}  {store[i]}")
+    print(f"\nExhaustive search: {elapsed_ms:.2f} ms")
+    print("Top match probing 1 of 3 partitions:", store[probed[0][0]] if probed else None)
@@ -5,6 +5,37 @@ import math
 def preprocess_sentence(sentence):
     return sentence.lower().split()
 
+def binary_vectors(words_a, words_b):
+    vocab = sorted(list(set(words_a + words_b)))
+    set_a, set_b = set(words_a), set(words_b)
+    vector_a = [1 if word in set_a else 0 for word in vocab]
+    vector_b = [1 if word in set_b else 0 for word in vocab]
+    return vector_a, vector_b
+
+def frequency_vectors(words_a, words_b):
+    vocab = sorted(list(set(words_a + words_b)))
+    freq_a = Counter(words_a)
+    freq_b = Counter(words_b)
+    return [freq_a[word] for word in vocab], [freq_b[word] for word in vocab]
+
+def euclidean_similarity(vector_a, vector_b):
+    euclidean_distance = np.sqrt(sum((a - b)**2 for a, b in zip(vector_a, vector_b)))
+    return 1 / (1 + euclidean_distance)
+
+def cosine_similarity(vector_a, vector_b):
+    dot_product = sum(a * b for a, b in zip(vector_a, vector_b))
+    magnitude_a = math.sqrt(sum(a**2 for a in vector_a))
+    magnitude_b = math.sqrt(sum(b**2 for b in vector_b))
+    return dot_product / (magnitude_a * magnitude_b) if magnitude_a * magnitude_b != 0 else 0
+
+def jaccard_similarity(set_a, set_b):
+    union = set_a.union(set_b)
+    return len(set_a.intersection(set_b)) / len(union) if len(union) != 0 else 0
+
+def overlap_similarity(set_a, set_b):
+    min_size = min(len(set_a), len(set_b))
+    return len(set_a.intersection(set_b)) / min_size if min_size != 0 else 0
+
 S1 = "The man saw a car in the park"
 S2 = "I saw the man park the car"
 
@@ -14,49 +45,33 @@ if __name__ == "__main__":
     words_S2 = preprocess_sentence(S2)
 
     # Euclidean
-    vocab = sorted(list(set(words_S1 + words_S2)))
-    vector_S1_binary = [1 if word in words_S1 else 0 for word in vocab]
-    vector_S2_binary = [1 if word in words_S2 else 0 for word in vocab]
-    euclidean_distance = np.sqrt(sum((a - b)**2 for a, b in zip(vector_S1_binary, vector_S2_binary)))
-    euclidean_similarity = 1 / (1 + euclidean_distance)
+    vector_S1_binary, vector_S2_binary = binary_vectors(words_S1, words_S2)
     print("a) Euclidean")
     print("Vector representation:")
     print("S1:", vector_S1_binary)
     print("S2:", vector_S2_binary)
-    print("Similarity:", euclidean_similarity)
+    print("Similarity:", euclidean_similarity(vector_S1_binary, vector_S2_binary))
 
     # Vector cosine
-    freq_S1 = Counter(words_S1)
-    freq_S2 = Counter(words_S2)
-    vector_S1_freq = [freq_S1[word] for word in vocab]
-    vector_S2_freq = [freq_S2[word] for word in vocab]
-    dot_product = sum(a * b for a, b in zip(vector_S1_freq, vector_S2_freq))
-    magnitude_S1 = math.sqrt(sum(a**2 for a in vector_S1_freq))
-    magnitude_S2 = math.sqrt(sum(a**2 for a in vector_S2_freq))
-    cosine_similarity = dot_product / (magnitude_S1 * magnitude_S2) if magnitude_S1 * magnitude_S2 != 0 else 0
+    vector_S1_freq, vector_S2_freq = frequency_vectors(words_S1, words_S2)
     print("b) Vector cosine")
     print("Vector representation:")
     print("S1:", vector_S1_freq)
     print("S2:", vector_S2_freq)
-    print("Similarity:", cosine_similarity)
+    print("Similarity:", cosine_similarity(vector_S1_freq, vector_S2_freq))
 
     # Jaccard
     set_S1 = set(words_S1)
     set_S2 = set(words_S2)
-    intersection = set_S1.intersection(set_S2)
-    union = set_S1.union(set_S2)
-    jaccard_similarity = len(intersection) / len(union) if len(union) != 0 else 0
     print("c) Jaccard")
     print("Set representation:")
     print("S1:", set_S1)
     print("S2:", set_S2)
-    print("Similarity:", jaccard_similarity)
+    print("Similarity:", jaccard_similarity(set_S1, set_S2))
 
     # Overlap
-    min_size = min(len(set_S1), len(set_S2))
-    overlap_similarity = len(intersection) / min_size if min_size != 0 else 0
     print("d) Overlap")
     print("Set representation:")
     print("S1:", set_S1)
     print("S2:", set_S2)
-    print("Similarity:", overlap_similarity)
\ No newline at end of file
+    print("Similarity:", overlap_similarity(set_S1, set_S2))
@@ -3,9 +3,6 @@ from nltk.corpus import wordnet as wn
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 
-nltk.download('wordnet')
-nltk.download('omw-1.4')
-
 def get_wordnet_relations(word):
     synsets = wn.synsets(word)
     results = {
@@ -142,6 +139,8 @@ class WordNetApp:
                 self.output.insert(tk.END, "Sorry, your word isn't really related. Try again!\n")
 
 if __name__ == "__main__":
+    nltk.download('wordnet')
+    nltk.download('omw-1.4')
     root = tk.Tk()
     app = WordNetApp(root)
     root.mainloop()
\ No newline at end of file
@@ -1,5 +1,4 @@
 from collections import defaultdict
-from transformers import AutoTokenizer
 
 corpus = [
     "there is a big house",
@@ -7,36 +6,25 @@ corpus = [
     "they buy the new house",
 ]
 
-tokenizer = AutoTokenizer.from_pretrained("gpt2")
-
-word_freqs = defaultdict(int)
-
-for text in corpus:
-    words_with_offsets = tokenizer.backend_tokenizer.pre_tokenizer.pre_tokenize_str(text)
-    new_words = [word for word, offset in words_with_offsets]
-    for word in new_words:
-        word_freqs[word] += 1
-
-print("Word frequencies:")
-print(word_freqs)
-print("\n")
-
-alphabet = []
-for word in word_freqs.keys():
-    for letter in word:
-        if letter not in alphabet:
-            alphabet.append(letter)
-alphabet.sort()
-
-print("Alphabet:")
-print(alphabet)
-print("\n")
-
-vocab = ["<|endoftext|>"] + alphabet.copy()
-
-splits = {word: [c for c in word] for word in word_freqs.keys()}
-
-def compute_pair_freqs(splits):
+def compute_word_freqs(corpus, pre_tokenize):
+    word_freqs = defaultdict(int)
+    for text in corpus:
+        words_with_offsets = pre_tokenize(text)
+        new_words = [word for word, offset in words_with_offsets]
+        for word in new_words:
+            word_freqs[word] += 1
+    return word_freqs
+
+def compute_alphabet(word_freqs):
+    alphabet = []
+    for word in word_freqs.keys():
+        for letter in word:
+            if letter not in alphabet:
+                alphabet.append(letter)
+    alphabet.sort()
+    return alphabet
+
+def compute_pair_freqs(splits, word_freqs):
     pair_freqs = defaultdict(int)
     for word, freq in word_freqs.items():
         split = splits[word]
@@ -47,15 +35,7 @@ def compute_pair_freqs(splits):
             pair_freqs[pair] += freq
     return pair_freqs
 
-pair_freqs = compute_pair_freqs(splits)
-print("Initial pair frequencies (first few):")
-for i, key in enumerate(pair_freqs.keys()):
-    print(f"{key}: {pair_freqs[key]}")
-    if i >= 5:
-        break
-print("\n")
-
-def merge_pair(a, b, splits):
+def merge_pair(a, b, splits, word_freqs):
     for word in word_freqs:
         split = splits[word]
         if len(split) == 1:
@@ -70,33 +50,28 @@ def merge_pair(a, b, splits):
         splits[word] = split
     return splits
 
-vocab_size = 50
-merges = {}
-
-while len(vocab) < vocab_size:
-    pair_freqs = compute_pair_freqs(splits)
-    if not pair_freqs:
-        break
-    best_pair = ""
-    max_freq = None
-    for pair, freq in pair_freqs.items():
-        if max_freq is None or max_freq < freq:
-            best_pair = pair
-            max_freq = freq
-    splits = merge_pair(*best_pair, splits)
-    merges[best_pair] = best_pair[0] + best_pair[1]
-    vocab.append(best_pair[0] + best_pair[1])
-
-print("Learned merges:")
-print(merges)
-print("\n")
-
-print("Final vocabulary:")
-print(vocab)
-print("\n")
-
-def tokenize(text):
-    pre_tokenize_result = tokenizer._tokenizer.pre_tokenizer.pre_tokenize_str(text)
+def train_bpe(word_freqs, vocab_size):
+    vocab = ["<|endoftext|>"] + compute_alphabet(word_freqs)
+    splits = {word: [c for c in word] for word in word_freqs.keys()}
+    merges = {}
+
+    while len(vocab) < vocab_size:
+        pair_freqs = compute_pair_freqs(splits, word_freqs)
+        if not pair_freqs:
+            break
+        best_pair = ""
+        max_freq = None
+        for pair, freq in pair_freqs.items():
+            if max_freq is None or max_freq < freq:
+                best_pair = pair
+                max_freq = freq
+        splits = merge_pair(*best_pair, splits, word_freqs)
+        merges[best_pair] = best_pair[0] + best_pair[1]
+        vocab.append(best_pair[0] + best_pair[1])
+    return vocab, merges
+
+def tokenize(text, merges, pre_tokenize):
+    pre_tokenize_result = pre_tokenize(text)
     pre_tokenized_text = [word for word, offset in pre_tokenize_result]
     splits = [[l for l in word] for word in pre_tokenized_text]
     for pair, merge in merges.items():
@@ -110,5 +85,41 @@ def tokenize(text):
             splits[idx] = split
     return sum(splits, [])
 
-print("Tokenizing example: 'they buy a red house'")
-print(tokenize("they buy a red house"))
+if __name__ == "__main__":
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained("gpt2")
+    pre_tokenize = tokenizer.backend_tokenizer.pre_tokenizer.pre_tokenize_str
+
+    word_freqs = compute_word_freqs(corpus, pre_tokenize)
+
+    print("Word frequencies:")
+    print(word_freqs)
+    print("\n")
+
+    print("Alphabet:")
+    print(compute_alphabet(word_freqs))
+    print("\n")
+
+    splits = {word: [c for c in word] for word in word_freqs.keys()}
+    pair_freqs = compute_pair_freqs(splits, word_freqs)
+    print("Initial pair frequencies (first few):")
+    for i, key in enumerate(pair_freqs.keys()):
+        print(f"{key}: {pair_freqs[key]}")
+        if i >= 5:
+            break
+    print("\n")
+
+    vocab_size = 50
+    vocab, merges = train_bpe(word_freqs, vocab_size)
+
+    print("Learned merges:")
+    print(merges)
+    print("\n")
+
+    print("Final vocabulary:")
+    print(vocab)
+    print("\n")
+
+    print("Tokenizing example: 'they buy a red house'")
+    print(tokenize("they buy a red house", merges, pre_tokenize))
@@ -6,11 +6,19 @@ from googletrans import Translator
 
 logging.set_verbosity_error()
 
-print("Loading BERT model...")
 model_name = 'bert-large-uncased-whole-word-masking-finetuned-squad'
-tokenizer = BertTokenizer.from_pretrained(model_name)
-model = BertForQuestionAnswering.from_pretrained(model_name)
-print("Model successfully loaded.\n")
+tokenizer = None
+model = None
+
+def load_model(name=model_name):
+    """Load the BERT QA model and tokenizer (once)."""
+    global tokenizer, model
+    if model is None:
+        print("Loading BERT model...")
+        tokenizer = BertTokenizer.from_pretrained(name)
+        model = BertForQuestionAnswering.from_pretrained(name)
+        print("Model successfully loaded.\n")
+    return tokenizer, model
 
 translator = Translator()
 
@@ -27,6 +35,7 @@ def translate_text(text, src_lang=None, dest_lang='en'):
         return text
 
 def question_answer(question, context):
+    load_model()
     input_ids = tokenizer.encode(question, context)
     tokens = tokenizer.convert_ids_to_tokens(input_ids)
 
@@ -57,6 +66,7 @@ def question_answer(question, context):
     return answer
 
 if __name__ == "__main__":
+    load_model()
     print("=== Multilingual Question Answering with BERT ===")
     context = input("Enter your context (English or Romanian):\n")
     question = input("\nEnter your question (English or Romanian):\n")
@@ -26,8 +26,9 @@ sentences = [
     "the groom loves dangerous planes more than the bride"
 ]
 
-for sent in sentences:
-    print(f"\nSentence: {sent}")
-    for tree in parser.parse(sent.split()):
-        print(tree)
-        tree.pretty_print()
\ No newline at end of file
+if __name__ == "__main__":
+    for sent in sentences:
+        print(f"\nSentence: {sent}")
+        for tree in parser.parse(sent.split()):
+            print(tree)
+            tree.pretty_print()
@@ -7,20 +7,25 @@ sentences = [
 ]
 
 MODEL = "en_core_web_sm"
-nlp = spacy.load(MODEL)
 
-for i, sent in enumerate(sentences, 1):
-    doc = nlp(sent)
-    header = f"Sentence {i}: {sent.strip()}"
-    print(header)
+def dependency_triples(doc):
+    return [(tok.text, tok.dep_, tok.head.text) for tok in doc]
 
-    print(f"{'Token':15}{'Dep':10}{'Head':15}{'HeadPos':10}")
-    for tok in doc:
-        line = f"{tok.text:15}{tok.dep_:10}{tok.head.text:15}{tok.head.pos_:10}"
-        print(line)
+if __name__ == "__main__":
+    nlp = spacy.load(MODEL)
 
-    triples = [(tok.text, tok.dep_, tok.head.text) for tok in doc]
-    print("\nDependency triples:")
-    print(triples)
+    for i, sent in enumerate(sentences, 1):
+        doc = nlp(sent)
+        header = f"Sentence {i}: {sent.strip()}"
+        print(header)
 
-    print("\n" + ("-" * 60) + "\n")
+        print(f"{'Token':15}{'Dep':10}{'Head':15}{'HeadPos':10}")
+        for tok in doc:
+            line = f"{tok.text:15}{tok.dep_:10}{tok.head.text:15}{tok.head.pos_:10}"
+            print(line)
+
+        triples = dependency_triples(doc)
+        print("\nDependency triples:")
+        print(triples)
+
+        print("\n" + ("-" * 60) + "\n")
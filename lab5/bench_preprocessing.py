@@ -0,0 +1,90 @@
+import argparse
+import random
+import re
+import string
+import time
+
+from nltk.stem import PorterStemmer
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from preprocessing import preprocess_corpus, stem
+
+SUFFIXES = ["", "", "s", "ing", "ed", "er", "ation", "ly", "ness", "ful"]
+
+
+def make_corpus(n_docs, vocab_size=20000, doc_len=120, seed=42):
+    """Synthetic corpus with a Zipf-like word distribution, plus stop words,
+    digits and punctuation so every cleaning step has something to do."""
+    rng = random.Random(seed)
+    roots = set()
+    while len(roots) < vocab_size:
+        roots.add(''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))))
+    words = [r + rng.choice(SUFFIXES) for r in sorted(roots)]
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    fillers = sorted(ENGLISH_STOP_WORDS) + ["1998", "42,", "(see", "e.g.", "--"]
+
+    documents = []
+    for _ in range(n_docs):
+        tokens = rng.choices(words, weights=weights, k=doc_len)
+        for i in rng.sample(range(doc_len), doc_len // 3):
+            tokens[i] = rng.choice(fillers)
+        documents.append(' '.join(tokens).capitalize() + '.')
+    return documents
+
+
+def baseline(documents):
+    """The original lab5 pipeline: uncached stemming, joined to a string and split again."""
+    stemmer = PorterStemmer()
+    stop_words = set(ENGLISH_STOP_WORDS)
+
+    def preprocess(text):
+        text = text.lower()
+        text = re.sub(r'[\d\W_]+', ' ', text)
+        tokens = [t for t in text.split() if t not in stop_words and len(t) > 2]
+        stems = [stemmer.stem(t) for t in tokens]
+        return ' '.join(stems)
+
+    return [doc.split() for doc in (preprocess(t) for t in documents)]
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark lab5 preprocessing")
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=1000)
+    parser.add_argument("--skip-baseline", action="store_true")
+    args = parser.parse_args()
+
+    print(f"Generating {args.docs} synthetic documents...")
+    documents = make_corpus(args.docs)
+
+    results = {}
+    if not args.skip_baseline:
+        reference, results["baseline"] = timed(baseline, documents)
+
+    stem.cache_clear()
+    serial, results["cached, 1 process"] = timed(preprocess_corpus, documents, n_jobs=1)
+    info = stem.cache_info()
+    print(f"Stem cache: {info.hits} hits, {info.misses} misses, {info.currsize} entries")
+
+    # Forked workers inherit this process's stem cache, so empty it first or
+    # the pool would skip the stemming the serial run paid for.
+    stem.cache_clear()
+    parallel, results["cached, process pool"] = timed(
+        preprocess_corpus, documents, n_jobs=args.jobs, chunksize=args.chunksize)
+
+    assert serial == parallel
+    if not args.skip_baseline:
+        assert serial == reference
+
+    print(f"\n=== Preprocessing {args.docs} documents ===")
+    base = results.get("baseline")
+    for name, seconds in results.items():
+        speedup = f"  ({base / seconds:.1f}x)" if base else ""
+        print(f"{name:22}{seconds:8.2f} s{speedup}")
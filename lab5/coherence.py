@@ -0,0 +1,150 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from gensim.models.coherencemodel import COHERENCE_MEASURES, SLIDING_WINDOW_SIZES
+from gensim.topic_coherence.text_analysis import (
+    WordOccurrenceAccumulator, ParallelWordOccurrenceAccumulator
+)
+
+SUPPORTED_MEASURES = ('c_v', 'c_uci', 'c_npmi')
+
+_accumulators = {}
+_worker_state = {}
+
+
+def texts_fingerprint(texts):
+    h = hashlib.sha1()
+    for tokens in texts:
+        h.update('\x1f'.join(tokens).encode())
+        h.update(b'\x1e')
+    return h.hexdigest()
+
+
+def _confirm(accumulator, coherence, topic_ids):
+    measure = COHERENCE_MEASURES[coherence]
+    segmented = measure.seg(topic_ids)
+    if coherence == 'c_v':
+        kwargs = dict(topics=topic_ids, measure='nlr', gamma=1)
+    else:
+        kwargs = dict(normalize=(coherence == 'c_npmi'))
+    return measure.aggr(measure.conf(segmented, accumulator, **kwargs))
+
+
+def _init_worker(accumulator, coherence):
+    _worker_state['accumulator'] = accumulator
+    _worker_state['coherence'] = coherence
+
+
+def _confirm_in_worker(topic_ids):
+    return _confirm(_worker_state['accumulator'], _worker_state['coherence'], topic_ids)
+
+
+class CoherenceEvaluator:
+    """Scores topic term lists against one shared set of co-occurrence statistics.
+
+    Sliding-window statistics are only gathered for the words that will be
+    scored: `relevant_terms` if given, otherwise the topic terms of the first
+    `score`/`score_many` call (a later call needing words outside them rescans
+    over the union). Statistics are cached per (texts, dictionary, window size,
+    words) in memory and optionally pickled under `cache_dir`, so any number of
+    topic sets over those words cost one scan; when a rescan widens the word
+    set, the narrower in-memory entry is dropped. Scoring runs on a pool of
+    `processes` workers (-1 for all cores but one, as in gensim).
+    Only the sliding-window measures c_v, c_uci and c_npmi are supported.
+    """
+
+    def __init__(self, texts, dictionary, coherence='c_v', window_size=None,
+                 processes=-1, relevant_terms=None, cache_dir=None):
+        if coherence not in SUPPORTED_MEASURES:
+            raise ValueError(f"Unsupported coherence measure '{coherence}', "
+                             f"expected one of {sorted(SUPPORTED_MEASURES)}")
+        if processes < 1:
+            processes = max((os.cpu_count() or 1) - 1, 1)
+        self.texts = texts
+        self.dictionary = dictionary
+        self.coherence = coherence
+        self.window_size = window_size or SLIDING_WINDOW_SIZES[coherence]
+        self.processes = processes
+        self.cache_dir = cache_dir
+        self.fixed_terms = relevant_terms is not None
+        self.relevant_ids = frozenset()
+        if self.fixed_terms:
+            self.relevant_ids = frozenset(dictionary.token2id[t] for t in relevant_terms)
+        self._accumulator = None
+        self._accumulator_key = None
+        self._texts_key = None
+
+    def _cache_key(self, ids):
+        if self._texts_key is None:
+            self._texts_key = texts_fingerprint(self.texts)
+        h = hashlib.sha1(self._texts_key.encode())
+        for i in sorted(ids):
+            h.update(f"{i}:{self.dictionary[i]}".encode() + b'\x1f')
+        return f"cooccurrence-w{self.window_size}-{h.hexdigest()[:16]}"
+
+    def _accumulate(self, ids):
+        key = self._cache_key(ids)
+        path = os.path.join(self.cache_dir, key + ".pkl") if self.cache_dir else None
+        if key in _accumulators:
+            accumulator = _accumulators[key]
+        elif path and os.path.exists(path):
+            with open(path, "rb") as f:
+                accumulator = pickle.load(f)
+        else:
+            if self.processes > 1:
+                accumulator = ParallelWordOccurrenceAccumulator(self.processes, ids, self.dictionary)
+            else:
+                accumulator = WordOccurrenceAccumulator(ids, self.dictionary)
+            accumulator = accumulator.accumulate(self.texts, self.window_size)
+            if path:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(accumulator, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+        _accumulators[key] = accumulator
+        return key, accumulator
+
+    def _accumulator_for(self, topic_ids):
+        needed = frozenset(int(i) for ids in topic_ids for i in ids)
+        if needed <= self.relevant_ids and self._accumulator is not None:
+            return self._accumulator
+        if self.fixed_terms:
+            missing = [self.dictionary[i] for i in needed - self.relevant_ids]
+            if missing:
+                raise ValueError(f"Terms not covered by relevant_terms: {missing}")
+        else:
+            self.relevant_ids = self.relevant_ids | needed
+        superseded = self._accumulator_key
+        self._accumulator_key, self._accumulator = self._accumulate(self.relevant_ids)
+        # The new word set covers the old one, so drop the smaller accumulator
+        # rather than keeping one per growth step in memory.
+        if superseded is not None and superseded != self._accumulator_key:
+            _accumulators.pop(superseded, None)
+        return self._accumulator
+
+    def _topic_ids(self, topics):
+        return [np.array([self.dictionary.token2id[t] for t in topic]) for topic in topics]
+
+    def score(self, topics):
+        """Coherence of one model, given its topics as lists of terms."""
+        topic_ids = self._topic_ids(topics)
+        return _confirm(self._accumulator_for(topic_ids), self.coherence, topic_ids)
+
+    def score_many(self, models):
+        """Coherence for each entry of a {name: topics} dict, scored in parallel."""
+        names = list(models)
+        topic_ids = [self._topic_ids(models[name]) for name in names]
+        accumulator = self._accumulator_for([ids for model_ids in topic_ids for ids in model_ids])
+        if self.processes <= 1 or len(names) < 2:
+            scores = [_confirm(accumulator, self.coherence, ids) for ids in topic_ids]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.processes, len(names)),
+                                     initializer=_init_worker,
+                                     initargs=(accumulator, self.coherence)) as executor:
+                scores = list(executor.map(_confirm_in_worker, topic_ids))
+        return dict(zip(names, scores))
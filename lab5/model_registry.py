@@ -0,0 +1,99 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+import gensim
+import numpy as np
+import scipy.sparse as sp
+import sklearn
+from sklearn.decomposition import TruncatedSVD, NMF
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_cache")
+
+
+def fingerprint(matrix):
+    """Content hash of a dense or sparse matrix, used to key cached models."""
+    h = hashlib.sha1()
+    if sp.issparse(matrix):
+        matrix = matrix.tocsr()
+        arrays = (matrix.indptr, matrix.indices, matrix.data)
+    else:
+        arrays = (np.asarray(matrix),)
+    h.update(repr((matrix.shape, str(matrix.dtype))).encode())
+    for arr in arrays:
+        h.update(np.ascontiguousarray(arr).data)
+    return h.hexdigest()
+
+
+class ModelRegistry:
+    """Caches fitted topic models and their document embeddings.
+
+    Entries are keyed by model family, input matrix fingerprint, fit
+    parameters and the sklearn/gensim versions, kept in memory and pickled
+    under `cache_dir` (lab5/model_cache by default) so later runs skip the fit
+    entirely.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._entries = {}
+
+    def _key(self, family, matrix, params, terms=None):
+        h = hashlib.sha1(f"{fingerprint(matrix)}|{repr(sorted(params.items()))}|"
+                         f"sklearn={sklearn.__version__}|gensim={gensim.__version__}".encode())
+        if terms is not None:
+            for term in terms:
+                h.update(term.encode() + b'\x1f')
+        return f"{family}-{h.hexdigest()[:16]}"
+
+    def get_or_fit(self, family, matrix, params, fit, terms=None):
+        """Return (model, embedding) for the key, calling `fit()` only on a cache miss.
+        `terms` are the matrix column labels, for models that keep their own vocabulary."""
+        key = self._key(family, matrix, params, terms)
+        if key in self._entries:
+            return self._entries[key]
+
+        path = os.path.join(self.cache_dir, key + ".pkl") if self.cache_dir else None
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        else:
+            entry = fit()
+            if path:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                # Write to a temp file first so an interrupted run never leaves a truncated pickle.
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    os.remove(tmp_path)
+                    raise
+        self._entries[key] = entry
+        return entry
+
+    def lsa(self, matrix, **params):
+        def fit():
+            model = TruncatedSVD(**params)
+            return model, model.fit_transform(matrix)
+        return self.get_or_fit("lsa", matrix, params, fit)
+
+    def nmf(self, matrix, **params):
+        def fit():
+            model = NMF(**params)
+            return model, model.fit_transform(matrix)
+        return self.get_or_fit("nmf", matrix, params, fit)
+
+    def lda(self, counts, dictionary, corpus, **params):
+        """Gensim LDA on the BoW corpus; `counts` is the matrix `corpus` was built from."""
+        def fit():
+            model = gensim.models.LdaModel(corpus=corpus, id2word=dictionary, **params)
+            doc_topics = np.array([
+                [prob for _, prob in model.get_document_topics(doc_bow, minimum_probability=0)]
+                for doc_bow in corpus
+            ])
+            return model, doc_topics
+        terms = [dictionary[i] for i in range(len(dictionary))]
+        return self.get_or_fit("lda", counts, params, fit, terms=terms)
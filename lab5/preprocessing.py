@@ -0,0 +1,53 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import os
+
+from nltk.stem import PorterStemmer
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+STEM_CACHE_SIZE = 2 ** 17
+DEFAULT_CHUNKSIZE = 1000
+
+_non_word = re.compile(r'[\d\W_]+')
+stemmer = PorterStemmer()
+stop_words = frozenset(ENGLISH_STOP_WORDS)
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem(token):
+    """Porter stem of a token, memoized since the same words repeat across documents."""
+    return stemmer.stem(token)
+
+
+def preprocess(text):
+    """Lowercase, strip digits/punctuation, drop stop words and short tokens, stem.
+    Returns the list of stems."""
+    tokens = _non_word.sub(' ', text.lower()).split()
+    return [stem(t) for t in tokens if len(t) > 2 and t not in stop_words]
+
+
+def _preprocess_chunk(chunk):
+    return [preprocess(text) for text in chunk]
+
+
+def preprocess_corpus(documents, n_jobs=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Tokenize a whole corpus into lists of stems.
+
+    Documents are split into chunks of `chunksize` and processed on a pool of
+    `n_jobs` worker processes (all cores by default); each worker keeps its own
+    stem cache. Corpora smaller than two chunks are processed in this process,
+    where the pool start-up would cost more than it saves.
+    """
+    documents = list(documents)
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs == 1 or len(documents) < 2 * chunksize:
+        return _preprocess_chunk(documents)
+
+    chunks = [documents[i:i + chunksize] for i in range(0, len(documents), chunksize)]
+    processed = []
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        for chunk_tokens in executor.map(_preprocess_chunk, chunks):
+            processed.extend(chunk_tokens)
+    return processed
@@ -0,0 +1,280 @@
+import argparse
+import glob
+import json
+import os
+import pickle
+import re
+import shutil
+import tempfile
+from itertools import islice
+
+import gensim
+import scipy.sparse as sp
+from gensim import corpora
+from sklearn.decomposition import MiniBatchNMF
+
+from preprocessing import preprocess_corpus
+from vectorization import count_matrix, gensim_corpus
+
+DICTIONARY_FILE = "dictionary.dict"
+CHUNK_PATTERN = "chunk-*.npz"
+CHUNK_STATS_FILE = "chunk_stats.jsonl"
+STATE_FILE = "state.json"
+# LdaMulticore cannot learn alpha, so both LDA variants use the same priors.
+LDA_ALPHA = 'symmetric'
+LDA_ETA = 'auto'
+
+
+def chunk_paths(chunk_dir):
+    return sorted(glob.glob(os.path.join(chunk_dir, CHUNK_PATTERN)))
+
+
+def next_chunk_index(chunk_dir):
+    indices = [int(m.group(1)) for m in
+               (re.fullmatch(r"chunk-(\d+)\.npz", os.path.basename(p)) for p in chunk_paths(chunk_dir)) if m]
+    return max(indices) + 1 if indices else 0
+
+
+def load_dictionary(chunk_dir):
+    path = os.path.join(chunk_dir, DICTIONARY_FILE)
+    return corpora.Dictionary.load(path) if os.path.exists(path) else None
+
+
+def build_dictionary(token_docs, chunk_dir, no_below=2, no_above=0.9, keep_n=100000):
+    """Fix the vocabulary of `chunk_dir` from one streaming pass over the whole
+    initial ingest, filtered with gensim's filter_extremes, and save it next to
+    the chunks."""
+    dictionary = corpora.Dictionary()
+    dictionary.add_documents(token_docs)
+    dictionary.filter_extremes(no_below=no_below, no_above=no_above, keep_n=keep_n)
+    os.makedirs(chunk_dir, exist_ok=True)
+    dictionary.save(os.path.join(chunk_dir, DICTIONARY_FILE))
+    return dictionary
+
+
+def write_bow_chunks(token_docs, chunk_dir, chunk_size=10000):
+    """Encode tokenized documents into BoW chunks on disk.
+
+    Every chunk uses the vocabulary stored in `chunk_dir` (built from
+    `token_docs` with `build_dictionary` if there is none yet), so all chunks
+    have the same columns. Tokens outside it are dropped; the share dropped
+    per chunk is printed and appended to chunk_stats.jsonl so vocabulary drift
+    stays visible. New chunks are numbered after the highest existing one, so
+    names are never reused even after old chunks are pruned. Returns the paths
+    written.
+    """
+    os.makedirs(chunk_dir, exist_ok=True)
+    dictionary = load_dictionary(chunk_dir)
+    if dictionary is None:
+        token_docs = list(token_docs)
+        dictionary = build_dictionary(token_docs, chunk_dir)
+    terms = [dictionary[i] for i in range(len(dictionary))]
+    next_index = next_chunk_index(chunk_dir)
+    token_docs = iter(token_docs)
+    written = []
+    while True:
+        batch = list(islice(token_docs, chunk_size))
+        if not batch:
+            break
+        counts, _ = count_matrix(batch, vocabulary=terms)
+        path = os.path.join(chunk_dir, f"chunk-{next_index:05d}.npz")
+        if os.path.exists(path):
+            raise FileExistsError(f"Refusing to overwrite existing chunk '{path}'")
+        sp.save_npz(path, counts)
+        written.append(path)
+        next_index += 1
+
+        n_tokens = sum(len(tokens) for tokens in batch)
+        dropped = n_tokens - int(counts.sum())
+        stats = {
+            "chunk": os.path.basename(path),
+            "documents": len(batch),
+            "tokens": n_tokens,
+            "dropped_tokens": dropped,
+            "dropped_fraction": dropped / n_tokens if n_tokens else 0.0
+        }
+        with open(os.path.join(chunk_dir, CHUNK_STATS_FILE), "a") as f:
+            f.write(json.dumps(stats) + "\n")
+        print(f"{stats['chunk']}: {len(batch)} documents, "
+              f"{stats['dropped_fraction']:.1%} of tokens outside the vocabulary")
+    return written
+
+
+class StreamingTopicModel:
+    """Online LDA and mini-batch NMF trained chunk by chunk with checkpoints.
+
+    LDA uses gensim's LdaMulticore when more than one worker is available,
+    LdaModel otherwise; NMF is sklearn's MiniBatchNMF on the BoW counts. Both
+    are updated incrementally, so new chunks refresh the models without
+    retraining on the old ones.
+    """
+
+    def __init__(self, dictionary, num_topics=3, workers=None, lda_chunksize=2000,
+                 nmf_batch_size=1024, random_state=42):
+        if workers is None:
+            workers = max((os.cpu_count() or 1) - 1, 1)
+        self.dictionary = dictionary
+        self.num_topics = num_topics
+        self.workers = workers
+        self.processed_chunks = []
+        self.documents_seen = 0
+
+        if workers > 1:
+            self.lda = gensim.models.LdaMulticore(
+                id2word=dictionary, num_topics=num_topics, workers=workers,
+                chunksize=lda_chunksize, random_state=random_state, alpha=LDA_ALPHA, eta=LDA_ETA)
+        else:
+            self.lda = gensim.models.LdaModel(
+                id2word=dictionary, num_topics=num_topics, chunksize=lda_chunksize,
+                update_every=1, random_state=random_state, alpha=LDA_ALPHA, eta=LDA_ETA)
+        self.nmf_batch_size = nmf_batch_size
+        self.nmf = MiniBatchNMF(
+            n_components=num_topics, batch_size=nmf_batch_size, init='nndsvda',
+            random_state=random_state)
+
+    def update(self, counts):
+        """Fold one BoW chunk (CSR, columns aligned with the dictionary) into both models."""
+        self.lda.update(gensim_corpus(counts))
+        # partial_fit treats its whole input as one mini-batch, so feed it row blocks.
+        for start in range(0, counts.shape[0], self.nmf_batch_size):
+            self.nmf.partial_fit(counts[start:start + self.nmf_batch_size])
+        self.documents_seen += counts.shape[0]
+
+    def refresh(self, chunk_dir, checkpoint_dir=None):
+        """Train on every chunk in `chunk_dir` not seen yet, checkpointing after each one."""
+        new_paths = [p for p in chunk_paths(chunk_dir)
+                     if os.path.basename(p) not in self.processed_chunks]
+        for path in new_paths:
+            self.update(sp.load_npz(path))
+            self.processed_chunks.append(os.path.basename(path))
+            if checkpoint_dir:
+                self.save(checkpoint_dir)
+        return new_paths
+
+    def save(self, checkpoint_dir):
+        """Write a checkpoint. Models go into a fresh subdirectory and state.json,
+        which names that subdirectory, is replaced atomically last, so a crash
+        mid-save leaves the previous checkpoint in effect."""
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        models_dir = tempfile.mkdtemp(prefix="models-", dir=checkpoint_dir)
+        self.lda.save(os.path.join(models_dir, "lda.model"))
+        with open(os.path.join(models_dir, "nmf.pkl"), "wb") as f:
+            pickle.dump(self.nmf, f, protocol=pickle.HIGHEST_PROTOCOL)
+        state = {
+            "models_dir": os.path.basename(models_dir),
+            "num_topics": self.num_topics,
+            "workers": self.workers,
+            "nmf_batch_size": self.nmf_batch_size,
+            "lda_alpha": LDA_ALPHA,
+            "lda_eta": LDA_ETA,
+            "processed_chunks": self.processed_chunks,
+            "documents_seen": self.documents_seen
+        }
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=checkpoint_dir)
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, os.path.join(checkpoint_dir, STATE_FILE))
+
+        for name in os.listdir(checkpoint_dir):
+            path = os.path.join(checkpoint_dir, name)
+            if name.startswith("models-") and name != state["models_dir"] and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    @classmethod
+    def load(cls, checkpoint_dir):
+        with open(os.path.join(checkpoint_dir, STATE_FILE)) as f:
+            state = json.load(f)
+        models_dir = os.path.join(checkpoint_dir, state["models_dir"])
+        model = cls.__new__(cls)
+        model.num_topics = state["num_topics"]
+        model.workers = state["workers"]
+        model.nmf_batch_size = state["nmf_batch_size"]
+        model.processed_chunks = state["processed_chunks"]
+        model.documents_seen = state["documents_seen"]
+        lda_class = gensim.models.LdaMulticore if model.workers > 1 else gensim.models.LdaModel
+        model.lda = lda_class.load(os.path.join(models_dir, "lda.model"))
+        model.dictionary = model.lda.id2word
+        with open(os.path.join(models_dir, "nmf.pkl"), "rb") as f:
+            model.nmf = pickle.load(f)
+        return model
+
+    def print_topics(self, top_n=10):
+        print(f"\n-- Online LDA ({self.documents_seen} documents) --")
+        for idx, topic in self.lda.print_topics(-1, num_words=top_n):
+            print(f"Topic {idx + 1}: {topic}")
+        print(f"\n-- Mini-batch NMF ({self.documents_seen} documents) --")
+        for i, comp in enumerate(self.nmf.components_):
+            top_idx = comp.argsort()[::-1][:top_n]
+            print(f"Component {i + 1}: {', '.join(self.dictionary[int(idx)] for idx in top_idx)}")
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def tokenized(path, batch_size):
+    """Preprocessed documents of a text file, preprocessed `batch_size` lines at a time."""
+    lines = read_lines(path)
+    while True:
+        batch = list(islice(lines, batch_size))
+        if not batch:
+            break
+        yield from preprocess_corpus(batch)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Out-of-core topic modeling for lab5")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest = subparsers.add_parser("ingest", help="preprocess a text file (one document per line) into BoW chunks")
+    ingest.add_argument("input")
+    ingest.add_argument("--chunks", default="bow_chunks")
+    ingest.add_argument("--chunk-size", type=int, default=10000)
+    ingest.add_argument("--no-below", type=int, default=2,
+                        help="first ingest only: drop terms in fewer documents")
+    ingest.add_argument("--no-above", type=float, default=0.9,
+                        help="first ingest only: drop terms in a larger share of documents")
+    ingest.add_argument("--keep-n", type=int, default=100000,
+                        help="first ingest only: vocabulary size limit")
+
+    train = subparsers.add_parser("train", help="train or refresh the models on chunks not seen yet")
+    train.add_argument("--chunks", default="bow_chunks")
+    train.add_argument("--checkpoint", default="topic_checkpoint")
+    train.add_argument("--topics", type=int, default=3)
+    train.add_argument("--workers", type=int, default=None)
+
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        if load_dictionary(args.chunks) is None:
+            # First ingest: build the vocabulary over the whole file, spooling
+            # the tokens so the second (encoding) pass does not preprocess again.
+            with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+                def spooled():
+                    for tokens in tokenized(args.input, args.chunk_size):
+                        spool.write(' '.join(tokens) + "\n")
+                        yield tokens
+                dictionary = build_dictionary(spooled(), args.chunks, no_below=args.no_below,
+                                              no_above=args.no_above, keep_n=args.keep_n)
+                print(f"Built a {len(dictionary)}-term vocabulary in '{args.chunks}'")
+                spool.seek(0)
+                written = write_bow_chunks((line.split() for line in spool), args.chunks, args.chunk_size)
+        else:
+            written = write_bow_chunks(tokenized(args.input, args.chunk_size), args.chunks, args.chunk_size)
+        print(f"Wrote {len(written)} chunk(s) to '{args.chunks}'")
+    else:
+        if os.path.exists(os.path.join(args.checkpoint, STATE_FILE)):
+            model = StreamingTopicModel.load(args.checkpoint)
+            print(f"Resumed from '{args.checkpoint}' ({model.documents_seen} documents seen)")
+        else:
+            dictionary = load_dictionary(args.chunks)
+            if dictionary is None:
+                parser.error(f"no dictionary in '{args.chunks}', run 'ingest' first")
+            model = StreamingTopicModel(dictionary, num_topics=args.topics, workers=args.workers)
+        new_paths = model.refresh(args.chunks, checkpoint_dir=args.checkpoint)
+        print(f"Trained on {len(new_paths)} new chunk(s)")
+        model.print_topics()
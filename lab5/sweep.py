@@ -0,0 +1,190 @@
+import argparse
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import gensim
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.decomposition import TruncatedSVD, NMF
+
+from coherence import CoherenceEvaluator
+from preprocessing import preprocess_corpus
+from vectorization import vectorize, gensim_corpus
+
+FAMILIES = ("lsa", "nmf", "lda")
+VECTORIZATIONS = ("bow", "tfidf")
+# Rough relative cost, used to start the slowest fits first.
+FAMILY_COST = {"lda": 2, "nmf": 1, "lsa": 0}
+
+_shared = {}
+
+
+def share_matrix(matrix, directory, name):
+    """Write a CSR matrix's arrays to .npy files that workers can memory-map."""
+    spec = {"shape": matrix.shape}
+    for part in ("data", "indices", "indptr"):
+        path = os.path.join(directory, f"{name}.{part}.npy")
+        np.save(path, getattr(matrix, part))
+        spec[part] = path
+    return spec
+
+
+def load_shared_matrix(spec):
+    arrays = [np.load(spec[part], mmap_mode="r") for part in ("data", "indices", "indptr")]
+    return sp.csr_matrix(tuple(arrays), shape=spec["shape"], copy=False)
+
+
+def _init_worker(specs, dictionary_path):
+    _shared["matrices"] = {name: load_shared_matrix(spec) for name, spec in specs.items()}
+    with open(dictionary_path, "rb") as f:
+        _shared["dictionary"] = pickle.load(f)
+
+
+def _top_terms(components, terms, top_n):
+    return [[terms[i] for i in np.argsort(comp)[::-1][:top_n]] for comp in components]
+
+
+def fit_one(family, vectorization, n_topics, matrix, dictionary, random_state=42,
+            top_n=10, lda_passes=20):
+    """Fit one model and return its metrics and top terms per topic."""
+    terms = [dictionary[i] for i in range(len(dictionary))]
+    reconstruction_error = perplexity = np.nan
+    start = time.perf_counter()
+    if family == "lsa":
+        model = TruncatedSVD(n_components=n_topics, random_state=random_state)
+        embedding = model.fit_transform(matrix)
+        fit_time = time.perf_counter() - start
+        # Components are orthonormal, so ||X - X V^T V||^2 = ||X||^2 - ||X V^T||^2.
+        residual = float((matrix.data ** 2).sum()) - float((embedding ** 2).sum())
+        reconstruction_error = np.sqrt(max(residual, 0.0))
+        topics = _top_terms(model.components_, terms, top_n)
+    elif family == "nmf":
+        model = NMF(n_components=n_topics, random_state=random_state, init='nndsvda', max_iter=500)
+        model.fit(matrix)
+        fit_time = time.perf_counter() - start
+        reconstruction_error = model.reconstruction_err_
+        topics = _top_terms(model.components_, terms, top_n)
+    elif family == "lda":
+        corpus = gensim_corpus(matrix)
+        model = gensim.models.LdaModel(
+            corpus=corpus, id2word=dictionary, num_topics=n_topics, random_state=random_state,
+            passes=lda_passes, alpha='auto', eta='auto')
+        fit_time = time.perf_counter() - start
+        perplexity = np.exp2(-model.log_perplexity(corpus))
+        topics = [[word for word, _ in model.show_topic(i, topn=top_n)] for i in range(n_topics)]
+    else:
+        raise ValueError(f"Unknown model family '{family}', expected one of {FAMILIES}")
+
+    return {
+        "family": family,
+        "vectorization": vectorization,
+        "n_topics": n_topics,
+        "fit_time": fit_time,
+        "reconstruction_error": reconstruction_error,
+        "perplexity": perplexity,
+        "topics": topics
+    }
+
+
+def _fit_in_worker(family, vectorization, n_topics, kwargs):
+    return fit_one(family, vectorization, n_topics, _shared["matrices"][vectorization],
+                   _shared["dictionary"], **kwargs)
+
+
+def sweep_tasks(topic_counts, families, vectorizations):
+    """All (family, vectorization, n_topics) combinations, slowest first.
+    LDA is only fitted on BoW counts."""
+    tasks = [(family, vectorization, k)
+             for family in families
+             for vectorization in vectorizations
+             for k in topic_counts
+             if not (family == "lda" and vectorization != "bow")]
+    return sorted(tasks, key=lambda t: (-FAMILY_COST[t[0]], -t[2]))
+
+
+def run_sweep(token_docs, topic_counts=(2, 3, 4, 5), families=FAMILIES,
+              vectorizations=VECTORIZATIONS, n_jobs=None, coherence='c_v', **fit_kwargs):
+    """Fit every model family/vectorization/topic count on a process pool.
+
+    The corpus is vectorized once and the matrices are handed to the workers
+    as memory-mapped .npy files. Coherence for all fits is scored afterwards
+    from a single co-occurrence scan. Returns one row per fit.
+    """
+    unknown = set(families) - set(FAMILIES) | set(vectorizations) - set(VECTORIZATIONS)
+    if unknown:
+        raise ValueError(f"Unknown model families/vectorizations: {sorted(unknown)}")
+    invalid = sorted(k for k in topic_counts if k < 1)
+    if invalid:
+        raise ValueError(f"Topic counts must be positive, got {invalid}")
+    if "lda" in families and "bow" not in vectorizations:
+        print("Warning: LDA is only fitted on BoW counts and 'bow' is not selected; skipping LDA.")
+    tasks = sweep_tasks(topic_counts, families, vectorizations)
+    if not tasks:
+        raise ValueError("Nothing to sweep: no valid (family, vectorization, topic count) combination "
+                         "(LDA needs the 'bow' vectorization)")
+
+    vectors = vectorize(token_docs)
+    too_large = sorted(k for k in topic_counts if k >= len(vectors.terms))
+    if too_large:
+        raise ValueError(f"Topic counts {too_large} are not below the vocabulary size ({len(vectors.terms)})")
+    matrices = {"bow": vectors.counts, "tfidf": vectors.tfidf}
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="lab5-sweep-") as shared_dir:
+        specs = {name: share_matrix(matrices[name], shared_dir, name) for name in vectorizations}
+        dictionary_path = os.path.join(shared_dir, "dictionary.pkl")
+        with open(dictionary_path, "wb") as f:
+            pickle.dump(vectors.dictionary, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with ProcessPoolExecutor(max_workers=max(1, min(n_jobs, len(tasks))), initializer=_init_worker,
+                                 initargs=(specs, dictionary_path)) as executor:
+            futures = [executor.submit(_fit_in_worker, *task, fit_kwargs) for task in tasks]
+            for future in as_completed(futures):
+                result = future.result()
+                print(f"Fitted {result['family']} ({result['vectorization']}, "
+                      f"{result['n_topics']} topics) in {result['fit_time']:.2f} s")
+                results.append(result)
+
+    topic_terms = {t for r in results for topic in r["topics"] for t in topic}
+    evaluator = CoherenceEvaluator(token_docs, vectors.dictionary, coherence=coherence,
+                                   processes=n_jobs, relevant_terms=topic_terms)
+    scores = evaluator.score_many({i: r["topics"] for i, r in enumerate(results)})
+    for i, result in enumerate(results):
+        result["coherence"] = scores[i]
+
+    table = pd.DataFrame(results, columns=[
+        "family", "vectorization", "n_topics", "coherence", "perplexity",
+        "reconstruction_error", "fit_time", "topics"
+    ])
+    return table.sort_values(["family", "vectorization", "n_topics"]).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Topic count / model family sweep for lab5")
+    parser.add_argument("input", help="text file with one document per line")
+    parser.add_argument("--topics", type=int, nargs="+", default=[2, 3, 4, 5, 6, 8, 10])
+    parser.add_argument("--families", nargs="+", choices=FAMILIES, default=list(FAMILIES))
+    parser.add_argument("--vectorizations", nargs="+", choices=VECTORIZATIONS, default=list(VECTORIZATIONS))
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--output", default="sweep_results.csv")
+    args = parser.parse_args()
+
+    with open(args.input, encoding="utf-8") as f:
+        documents = [line.strip() for line in f if line.strip()]
+    token_docs = preprocess_corpus(documents, n_jobs=args.jobs)
+
+    try:
+        table = run_sweep(token_docs, topic_counts=args.topics, families=args.families,
+                          vectorizations=args.vectorizations, n_jobs=args.jobs)
+    except ValueError as e:
+        parser.error(str(e))
+    print("\n=== Sweep results ===")
+    print(table.drop(columns="topics").to_string(index=False))
+    table.to_csv(args.output, index=False)
+    print(f"\nResults saved as '{args.output}'")
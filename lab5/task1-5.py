@@ -1,18 +1,15 @@
 import wikipedia
 import pandas as pd
-import re
-from nltk.stem import PorterStemmer
-from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer, ENGLISH_STOP_WORDS
-from sklearn.decomposition import TruncatedSVD, NMF
 import numpy as np
-import gensim
-from gensim import corpora
-from gensim.models import CoherenceModel
 import pyLDAvis
 import pyLDAvis.gensim_models as gensimvis
 from sklearn.preprocessing import normalize
 import plotly.express as px
-from random import shuffle
+from random import Random
+from preprocessing import preprocess_corpus
+from vectorization import vectorize
+from model_registry import ModelRegistry
+from coherence import CoherenceEvaluator
 
 topics = {
     "plants": ["Lavender", "Cactus", "Rose", "Sunflower", "Chrysanthemum"],
@@ -35,49 +32,37 @@ for category, pages in topics.items():
             print(f"Could not fetch page '{page}': {e}")
 
 combined = list(zip(documents, titles, categories))
-shuffle(combined)
+Random(42).shuffle(combined)
 documents, titles, categories = zip(*combined)
 documents, titles, categories = list(documents), list(titles), list(categories)
 
-stemmer = PorterStemmer()
-stop_words = set(ENGLISH_STOP_WORDS)
+processed_docs = preprocess_corpus(documents)
 
-def preprocess(text):
-    text = text.lower()
-    text = re.sub(r'[\d\W_]+', ' ', text)
-    tokens = [t for t in text.split() if t not in stop_words and len(t) > 2]
-    stems = [stemmer.stem(t) for t in tokens]
-    return ' '.join(stems)
-
-processed_docs = [preprocess(t) for t in documents]
-
-bow_vectorizer = CountVectorizer()
-tfidf_vectorizer = TfidfVectorizer()
-
-bow_matrix = bow_vectorizer.fit_transform(processed_docs)
-tfidf_matrix = tfidf_vectorizer.fit_transform(processed_docs)
+vectors = vectorize(processed_docs)
+bow_matrix = vectors.counts
+tfidf_matrix = vectors.tfidf
+terms = vectors.terms
 
 df = pd.DataFrame({
     "Title": titles,
     "Original (first 300 chars)": [d[:300] + "..." for d in documents],
-    "Preprocessed": processed_docs
+    "Preprocessed": [' '.join(tokens) for tokens in processed_docs]
 })
 
 print("=== Original vs Preprocessed Texts ===")
 print(df, "\n")
 
-print("Vocabulary size (BoW):", len(bow_vectorizer.get_feature_names_out()))
-print("First 10 words in vocabulary:", bow_vectorizer.get_feature_names_out()[:10], "\n")
+print("Vocabulary size (BoW):", len(terms))
+print("First 10 words in vocabulary:", terms[:10], "\n")
 
 n_components = 3
+registry = ModelRegistry()
 print(f"\n=== Latent Semantic Analysis (LSA) with {n_components} components ===")
 
-def print_lsa_results(svd_model, vectorizer, name):
-    terms = vectorizer.get_feature_names_out()
+def print_lsa_results(svd_model, embedding, terms, name):
     explained = svd_model.explained_variance_ratio_.sum()
     print(f"\n-- {name} LSA --")
-    print(
-        f"Transformed shape: {svd_model.transform(bow_matrix).shape if name == 'BoW' else svd_model.transform(tfidf_matrix).shape}")
+    print(f"Transformed shape: {embedding.shape}")
     print(f"Explained variance ratio (sum): {explained:.4f}")
     top_n = 10
     for i, comp in enumerate(svd_model.components_):
@@ -85,18 +70,15 @@ def print_lsa_results(svd_model, vectorizer, name):
         top_terms = [terms[idx] for idx in top_idx]
         print(f"Component {i + 1}: {', '.join(top_terms)}")
 
-svd_bow = TruncatedSVD(n_components=n_components, random_state=42)
-bow_lsa = svd_bow.fit_transform(bow_matrix)
-print_lsa_results(svd_bow, bow_vectorizer, 'BoW')
+svd_bow, bow_lsa = registry.lsa(bow_matrix, n_components=n_components, random_state=42)
+print_lsa_results(svd_bow, bow_lsa, terms, 'BoW')
 
-svd_tfidf = TruncatedSVD(n_components=n_components, random_state=42)
-tfidf_lsa = svd_tfidf.fit_transform(tfidf_matrix)
-print_lsa_results(svd_tfidf, tfidf_vectorizer, 'TF-IDF')
+svd_tfidf, tfidf_lsa = registry.lsa(tfidf_matrix, n_components=n_components, random_state=42)
+print_lsa_results(svd_tfidf, tfidf_lsa, terms, 'TF-IDF')
 
 print(f"\n=== Non-negative Matrix Factorization (NMF) with {n_components} components ===")
 
-def print_nmf_results(nmf_model, components, vectorizer, name):
-    terms = vectorizer.get_feature_names_out()
+def print_nmf_results(nmf_model, components, terms, name):
     print(f"\n-- {name} NMF --")
     print(f"Components shape: {components.shape}")
     print(f"Reconstruction error: {getattr(nmf_model, 'reconstruction_err_', None)}")
@@ -106,15 +88,13 @@ def print_nmf_results(nmf_model, components, vectorizer, name):
         top_terms = [terms[idx] for idx in top_idx]
         print(f"Component {i + 1}: {', '.join(top_terms)}")
 
-nmf_bow = NMF(n_components=n_components, random_state=42, init='nndsvda', max_iter=500)
-W_bow = nmf_bow.fit_transform(bow_matrix)
+nmf_bow, W_bow = registry.nmf(bow_matrix, n_components=n_components, random_state=42, init='nndsvda', max_iter=500)
 H_bow = nmf_bow.components_
-print_nmf_results(nmf_bow, H_bow, bow_vectorizer, 'BoW')
+print_nmf_results(nmf_bow, H_bow, terms, 'BoW')
 
-nmf_tfidf = NMF(n_components=n_components, random_state=42, init='nndsvda', max_iter=500)
-W_tfidf = nmf_tfidf.fit_transform(tfidf_matrix)
+nmf_tfidf, W_tfidf = registry.nmf(tfidf_matrix, n_components=n_components, random_state=42, init='nndsvda', max_iter=500)
 H_tfidf = nmf_tfidf.components_
-print_nmf_results(nmf_tfidf, H_tfidf, tfidf_vectorizer, 'TF-IDF')
+print_nmf_results(nmf_tfidf, H_tfidf, terms, 'TF-IDF')
 
 print("BoW matrix shape:", bow_matrix.shape)
 print("TF-IDF matrix shape:", tfidf_matrix.shape)
@@ -122,13 +102,14 @@ print("Done: LSA and NMF computed successfully.")
 
 print("\n=== Latent Dirichlet Allocation (LDA) ===")
 
-texts = [doc.split() for doc in processed_docs]
-dictionary = corpora.Dictionary(texts)
-corpus = [dictionary.doc2bow(text) for text in texts]
+texts = processed_docs
+dictionary = vectors.dictionary
+corpus = vectors.corpus
 
-lda_model = gensim.models.LdaModel(
-    corpus=corpus,
-    id2word=dictionary,
+lda_model, lda_doc_topics = registry.lda(
+    bow_matrix,
+    dictionary,
+    corpus,
     num_topics=n_components,
     random_state=42,
     passes=20,
@@ -139,14 +120,26 @@ lda_model = gensim.models.LdaModel(
 for idx, topic in lda_model.print_topics(-1):
     print(f"Topic {idx + 1}: {topic}")
 
-coherence_model_lda = CoherenceModel(
-    model=lda_model,
-    texts=texts,
-    dictionary=dictionary,
-    coherence='c_v',
-    processes=1
-)
-coherence_lda = coherence_model_lda.get_coherence()
+# === Top terms per topic, scored for coherence below ===
+def get_top_terms_per_topic(components, terms, top_n=10):
+    topic_terms = []
+    for comp in components:
+        top_idx = np.argsort(comp)[::-1][:top_n]
+        topic_terms.append([terms[i] for i in top_idx])
+    return topic_terms
+
+lsa_bow_terms = get_top_terms_per_topic(svd_bow.components_, terms)
+lsa_tfidf_terms = get_top_terms_per_topic(svd_tfidf.components_, terms)
+nmf_bow_terms = get_top_terms_per_topic(nmf_bow.components_, terms)
+nmf_tfidf_terms = get_top_terms_per_topic(nmf_tfidf.components_, terms)
+
+lda_terms = [[word for word, _ in lda_model.show_topic(i, topn=20)] for i in range(n_components)]
+
+all_topic_terms = {t for model_terms in (lsa_bow_terms, lsa_tfidf_terms, nmf_bow_terms, nmf_tfidf_terms, lda_terms)
+                   for topic in model_terms for t in topic}
+coherence_evaluator = CoherenceEvaluator(texts, dictionary, coherence='c_v', processes=1,
+                                         relevant_terms=all_topic_terms)
+coherence_lda = coherence_evaluator.score(lda_terms)
 print(f"\nCoherence Score (LDA): {coherence_lda:.4f}")
 
 perplexity = lda_model.log_perplexity(corpus)
@@ -156,50 +149,19 @@ LDAvis_data = gensimvis.prepare(lda_model, corpus, dictionary)
 pyLDAvis.save_html(LDAvis_data, 'lda_topics_visualization.html')
 print("LDA visualization saved as 'lda_topics_visualization.html'")
 
-# === Coherence for LSA and NMF ===
-def compute_coherence_for_terms(topic_terms, texts, dictionary, measure='c_v'):
-    coherence_model = CoherenceModel(
-        topics=topic_terms,
-        texts=texts,
-        dictionary=dictionary,
-        coherence=measure,
-        processes=1
-    )
-    return coherence_model.get_coherence()
-
-def get_top_terms_per_topic(components, terms, top_n=10):
-    topic_terms = []
-    for comp in components:
-        top_idx = np.argsort(comp)[::-1][:top_n]
-        topic_terms.append([terms[i] for i in top_idx])
-    return topic_terms
-
-lsa_bow_terms = get_top_terms_per_topic(svd_bow.components_, bow_vectorizer.get_feature_names_out())
-lsa_tfidf_terms = get_top_terms_per_topic(svd_tfidf.components_, tfidf_vectorizer.get_feature_names_out())
-nmf_bow_terms = get_top_terms_per_topic(nmf_bow.components_, bow_vectorizer.get_feature_names_out())
-nmf_tfidf_terms = get_top_terms_per_topic(nmf_tfidf.components_, tfidf_vectorizer.get_feature_names_out())
-
 print("\n=== Coherence Scores Across Models ===")
-coh_lsa_bow = compute_coherence_for_terms(lsa_bow_terms, texts, dictionary)
-coh_lsa_tfidf = compute_coherence_for_terms(lsa_tfidf_terms, texts, dictionary)
-coh_nmf_bow = compute_coherence_for_terms(nmf_bow_terms, texts, dictionary)
-coh_nmf_tfidf = compute_coherence_for_terms(nmf_tfidf_terms, texts, dictionary)
+coherence_scores = coherence_evaluator.score_many({
+    "LSA (BoW)": lsa_bow_terms,
+    "LSA (TF-IDF)": lsa_tfidf_terms,
+    "NMF (BoW)": nmf_bow_terms,
+    "NMF (TF-IDF)": nmf_tfidf_terms
+})
+coherence_scores["LDA"] = coherence_lda
 
-print(f"LSA (BoW): {coh_lsa_bow:.4f}")
-print(f"LSA (TF-IDF): {coh_lsa_tfidf:.4f}")
-print(f"NMF (BoW): {coh_nmf_bow:.4f}")
-print(f"NMF (TF-IDF): {coh_nmf_tfidf:.4f}")
-print(f"LDA: {coherence_lda:.4f}")
+for name, score in coherence_scores.items():
+    print(f"{name}: {score:.4f}")
 
 # Visual comparison
-coherence_scores = {
-    "LSA (BoW)": coh_lsa_bow,
-    "LSA (TF-IDF)": coh_lsa_tfidf,
-    "NMF (BoW)": coh_nmf_bow,
-    "NMF (TF-IDF)": coh_nmf_tfidf,
-    "LDA": coherence_lda
-}
-
 fig = px.bar(
     x=list(coherence_scores.keys()),
     y=list(coherence_scores.values()),
@@ -242,10 +204,10 @@ def plot_interactive(coords, title, xlab, ylab, zlab):
     )
     fig.show()
 
-lsa_bow_3d = TruncatedSVD(n_components=3, random_state=42).fit_transform(bow_matrix)
+lsa_bow_3d = bow_lsa[:, :3]
 plot_interactive(lsa_bow_3d, "LSA (BoW) - 3D Semantic Projection", "Component 1", "Component 2", "Component 3")
 
-lsa_tfidf_3d = TruncatedSVD(n_components=3, random_state=42).fit_transform(tfidf_matrix)
+lsa_tfidf_3d = tfidf_lsa[:, :3]
 plot_interactive(lsa_tfidf_3d, "LSA (TF-IDF) - 3D Semantic Projection", "Component 1", "Component 2", "Component 3")
 
 nmf_bow_3d = normalize(W_bow)[:, :3]
@@ -254,11 +216,6 @@ plot_interactive(nmf_bow_3d, "NMF (BoW) - 3D Topic Clustering", "Topic 1 weight"
 nmf_tfidf_3d = normalize(W_tfidf)[:, :3]
 plot_interactive(nmf_tfidf_3d, "NMF (TF-IDF) - 3D Topic Clustering", "Topic 1 weight", "Topic 2 weight", "Topic 3 weight")
 
-lda_doc_topics = []
-for doc_bow in corpus:
-    doc_topic = [prob for _, prob in lda_model.get_document_topics(doc_bow, minimum_probability=0)]
-    lda_doc_topics.append(doc_topic)
-lda_doc_topics = np.array(lda_doc_topics)
 lda_3d = lda_doc_topics[:, :3]
 plot_interactive(lda_3d, "LDA - 3D Document-Topic Probability Space", "Topic 1 prob", "Topic 2 prob", "Topic 3 prob")
 
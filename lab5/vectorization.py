@@ -0,0 +1,89 @@
+from collections import namedtuple
+
+import numpy as np
+import scipy.sparse as sp
+from gensim import corpora
+from gensim.matutils import Sparse2Corpus
+from sklearn.feature_extraction.text import TfidfTransformer
+
+Vectorized = namedtuple("Vectorized", ["counts", "tfidf", "terms", "dictionary", "corpus"])
+
+
+def count_matrix(token_docs, vocabulary=None):
+    """Count tokens in one pass over the corpus.
+
+    Returns a CSR document-term count matrix and the array of terms for its
+    columns, sorted alphabetically like CountVectorizer. If `vocabulary` is
+    given, its order is kept and tokens outside it are ignored.
+    """
+    fixed = vocabulary is not None
+    vocab = {t: i for i, t in enumerate(vocabulary)} if fixed else {}
+    indices, data, indptr = [], [], [0]
+    for tokens in token_docs:
+        doc_counts = {}
+        for t in tokens:
+            idx = vocab.get(t)
+            if idx is None:
+                if fixed:
+                    continue
+                idx = vocab[t] = len(vocab)
+            doc_counts[idx] = doc_counts.get(idx, 0) + 1
+        indices.extend(doc_counts.keys())
+        data.extend(doc_counts.values())
+        indptr.append(len(indices))
+
+    indices = np.asarray(indices, dtype=np.int32)
+    if fixed:
+        terms = np.asarray(list(vocabulary), dtype=object)
+    else:
+        terms = np.asarray(sorted(vocab), dtype=object)
+        new_index = np.empty(len(vocab), dtype=np.int32)
+        new_index[[vocab[t] for t in terms]] = np.arange(len(terms), dtype=np.int32)
+        indices = new_index[indices]
+
+    counts = sp.csr_matrix(
+        (np.asarray(data, dtype=np.int64), indices, np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(terms))
+    )
+    counts.sort_indices()
+    return counts, terms
+
+
+def tfidf_from_counts(counts):
+    """TF-IDF weights derived from a count matrix, equivalent to TfidfVectorizer's defaults."""
+    transformer = TfidfTransformer()
+    return transformer, transformer.fit_transform(counts)
+
+
+def gensim_dictionary(terms, counts):
+    """A gensim Dictionary over the same column ids as `counts`, filled from the
+    matrix instead of rescanning the texts."""
+    dictionary = corpora.Dictionary()
+    dictionary.token2id = {t: i for i, t in enumerate(terms)}
+    dfs = np.bincount(counts.indices, minlength=len(terms))
+    cfs = np.asarray(counts.sum(axis=0)).ravel()
+    dictionary.dfs = dict(enumerate(dfs.tolist()))
+    dictionary.cfs = dict(enumerate(cfs.tolist()))
+    dictionary.num_docs = counts.shape[0]
+    dictionary.num_pos = int(cfs.sum())
+    dictionary.num_nnz = counts.nnz
+    return dictionary
+
+
+def gensim_corpus(counts):
+    """Bag-of-words corpus for gensim that iterates over the CSR rows in place."""
+    return Sparse2Corpus(counts, documents_columns=False)
+
+
+def vectorize(token_docs):
+    """Build the BoW matrix, TF-IDF matrix, gensim dictionary and gensim corpus
+    from a single tokenization/counting pass."""
+    counts, terms = count_matrix(token_docs)
+    _, tfidf = tfidf_from_counts(counts)
+    return Vectorized(
+        counts=counts,
+        tfidf=tfidf,
+        terms=terms,
+        dictionary=gensim_dictionary(terms, counts),
+        corpus=gensim_corpus(counts)
+    )